@@ -4,8 +4,8 @@ Main entry point for the Automated Defect Inspection System.
 This script orchestrates the entire pipeline:
 1. Sets up the application logger.
 2. Specifies the image data to be processed.
-3. Iterates through each image, passing it to the relevant modules for
-   preprocessing, analysis, and visualization.
+3. Preprocesses the images concurrently on a thread pool, then passes each
+   result to the relevant modules for analysis and visualization.
 
 Author: Vishal R
 Date: September 27, 2025
@@ -13,11 +13,26 @@ Date: September 27, 2025
 
 import os
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from src.data_loader import preprocess_image
 from src.defect_detector import find_and_analyze_ring
 from src.visualizer import visualize_results
 from utils.logger_config import setup_logger
 
+def preprocess_in_order(executor, image_paths, max_in_flight):
+    """
+    Yields preprocess_image results in input order, keeping at most
+    max_in_flight images submitted but not yet consumed.
+    """
+    pending = deque()
+    for image_path in image_paths:
+        if len(pending) == max_in_flight:
+            yield pending.popleft().result()
+        pending.append(executor.submit(preprocess_image, image_path))
+    while pending:
+        yield pending.popleft().result()
+
 def run_inspection_pipeline():
     """
     Executes the full defect detection and analysis pipeline.
@@ -39,25 +54,33 @@ def run_inspection_pipeline():
         "good.png",
     ]
 
-    for file_name in image_files:
-        image_path = os.path.join(data_dir, file_name)
-        logging.info("Processing image: {}".format(image_path))
+    image_paths = [os.path.join(data_dir, file_name) for file_name in image_files]
+
+    # Step A: Preprocess the images on a thread pool. OpenCV releases the GIL
+    # while decoding, filtering and thresholding, so disk I/O for the next
+    # images overlaps with the analysis of the current one. Submissions are
+    # windowed so only a couple of images per worker are held in memory.
+    workers = os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        preprocessed = preprocess_in_order(executor, image_paths, 2 * workers)
 
-        # Step A: Preprocess the image
-        original_img, processed_img = preprocess_image(image_path)
-        if original_img is None:
-            continue
+        for file_name, image_path, (original_img, binary_img) in zip(
+            image_files, image_paths, preprocessed
+        ):
+            logging.info("Processing image: {}".format(image_path))
+            if original_img is None:
+                continue
 
-        # Step B: Run inference to find defects
-        result = find_and_analyze_ring(processed_img)
-        logging.info("Analysis result: {}".format(result['status']))
-        if result['status'] == 'Defective':
-            logging.info("Detected Defect Type: {}".format(result['defect_type']))
-        elif result['status'] == 'Error':
-            logging.error("An error occurred: {}".format(result['defect_type']))
+            # Step B: Run inference to find defects
+            result = find_and_analyze_ring(binary_img)
+            logging.info("Analysis result: {}".format(result['status']))
+            if result['status'] == 'Defective':
+                logging.info("Detected Defect Type: {}".format(result['defect_type']))
+            elif result['status'] == 'Error':
+                logging.error("An error occurred: {}".format(result['defect_type']))
 
-        # Step C: Visualize the output
-        visualize_results(original_img, result, file_name, output_dir)
+            # Step C: Visualize the output
+            visualize_results(original_img, result, file_name, output_dir)
 
     logging.info("--- Inspection Complete ---")
 
@@ -8,6 +8,9 @@ can be made here without altering the core application logic.
 
 # --- Preprocessing Parameters ---
 GAUSSIAN_BLUR_KERNEL = (5, 5)
+# Run the Gaussian blur on the GPU when OpenCV is built with CUDA and a
+# CUDA device is present. Falls back to the CPU path otherwise.
+USE_CUDA = True
 
 # --- Defect Detection Parameters ---
 # Defines the minimum "jump" in radius (in pixels) between adjacent
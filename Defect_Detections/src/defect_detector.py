@@ -9,25 +9,93 @@ components.
 import cv2
 import numpy as np
 import logging
+from numba import njit
 from src.config import JUMP_THRESHOLD
 
-def find_and_analyze_ring(processed_image: np.ndarray) -> dict:
+@njit(cache=True, fastmath=True)
+def _analyze_contour(pts: np.ndarray, cx: int, cy: int) -> tuple:
     """
-    Finds the annular object and analyzes its shape for defects.
+    Computes the radial profile of a contour in a single compiled pass.
+
+    Returns (max_jump, defect_idx, dev_radius, avg_radius), where the jump
+    is measured between each point and its predecessor (wrapping around).
     """
-    _, binary_image = cv2.threshold(
-        processed_image, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU
-    )
-    contours, _ = cv2.findContours(
-        binary_image, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE
+    n = pts.shape[0]
+    fcx = np.float32(cx)
+    fcy = np.float32(cy)
+
+    # The point furthest from the mean radius is either the nearest or the
+    # furthest point, so track those on squared radii (no extra sqrt) and
+    # avoid storing the radii at all.
+    dx = pts[n - 1, 0] - fcx
+    dy = pts[n - 1, 1] - fcy
+    prev = np.sqrt(dx * dx + dy * dy)
+    total = 0.0
+    max_jump = np.float32(-1.0)
+    defect_idx = 0
+    min_r2 = np.inf
+    max_r2 = -np.inf
+    min_idx = 0
+    max_idx = 0
+    for i in range(n):
+        dx = pts[i, 0] - fcx
+        dy = pts[i, 1] - fcy
+        r2 = dx * dx + dy * dy
+        r = np.sqrt(r2)
+        total += r
+        jump = abs(r - prev)
+        if jump > max_jump:
+            max_jump = jump
+            defect_idx = i
+        if r2 < min_r2:
+            min_r2 = r2
+            min_idx = i
+        if r2 > max_r2:
+            max_r2 = r2
+            max_idx = i
+        prev = r
+    avg_radius = total / n
+
+    min_r = np.sqrt(min_r2)
+    max_r = np.sqrt(max_r2)
+    low_dev = avg_radius - min_r
+    high_dev = max_r - avg_radius
+    if low_dev > high_dev or (low_dev == high_dev and min_idx < max_idx):
+        dev_radius = min_r
+    else:
+        dev_radius = max_r
+
+    return max_jump, defect_idx, dev_radius, avg_radius
+
+def find_and_analyze_ring(binary_image: np.ndarray) -> dict:
+    """
+    Finds the annular object in the binary mask and analyzes its shape for defects.
+    """
+    # Label the foreground in a single pass and keep only the largest
+    # component (the ring), so spurious blobs never reach findContours.
+    num_labels, labels, stats, _ = cv2.connectedComponentsWithStats(
+        binary_image, connectivity=8
     )
-    logging.debug(f"Found {len(contours)} initial contours.")
+    logging.debug("Found %d foreground components.", num_labels - 1)
+
+    if num_labels < 2:
+        return {"status": "Error", "defect_type": "Segmentation Failed"}
 
-    if len(contours) < 2:
+    ring_label = 1 + np.argmax(stats[1:, cv2.CC_STAT_AREA])
+    x, y, w, h = stats[ring_label, :4]
+    ring_mask = (labels[y:y + h, x:x + w] == ring_label).astype(np.uint8)
+
+    # The ring's boundary is its external contour; the inner edge is its
+    # largest hole.
+    contours, hierarchy = cv2.findContours(
+        ring_mask, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE, offset=(int(x), int(y))
+    )
+    holes = [c for c, info in zip(contours, hierarchy[0]) if info[3] != -1]
+    if not holes:
         return {"status": "Error", "defect_type": "Segmentation Failed"}
 
-    contours = sorted(contours, key=cv2.contourArea, reverse=True)[:2]
-    outer_contour, inner_contour = contours
+    outer_contour = next(c for c, info in zip(contours, hierarchy[0]) if info[3] == -1)
+    inner_contour = max(holes, key=cv2.contourArea)
 
     try:
         m_outer = cv2.moments(outer_contour)
@@ -41,21 +109,19 @@ def find_and_analyze_ring(processed_image: np.ndarray) -> dict:
 
     center_x = int((cx_outer + cx_inner) / 2)
     center_y = int((cy_outer + cy_inner) / 2)
-    logging.debug(f"Calculated robust center at: ({center_x}, {center_y})")
+    logging.debug("Calculated robust center at: (%d, %d)", center_x, center_y)
 
     for contour, name in [(outer_contour, "Outer"), (inner_contour, "Inner")]:
-        radii = np.sqrt(((contour - (center_x, center_y))**2).sum(axis=2)).flatten()
-        avg_radius = np.mean(radii)
-        diffs = np.abs(radii - np.roll(radii, 1))
-        max_jump = np.max(diffs)
-        logging.debug(f"Max radial jump for {name} contour: {max_jump:.2f} pixels.")
+        pts = contour.reshape(-1, 2).astype(np.float32)
+        max_jump, defect_idx, dev_radius, avg_radius = _analyze_contour(
+            pts, center_x, center_y
+        )
+        logging.debug("Max radial jump for %s contour: %.2f pixels.", name, max_jump)
 
         if max_jump > JUMP_THRESHOLD:
-            logging.info(f"Defect detected on {name} contour!")
-            defect_idx = np.argmax(diffs)
+            logging.info("Defect detected on %s contour!", name)
             defect_point = contour[defect_idx][0]
-            dev_radius = radii[np.argmax(np.abs(radii - avg_radius))]
-            
+
             defect_type = "Unknown"
             if name == "Outer":
                 defect_type = "Cut" if dev_radius < avg_radius else "Flash"
@@ -7,7 +7,6 @@ them to a file.
 """
 
 import cv2
-import matplotlib.pyplot as plt
 import numpy as np
 import logging
 import os
@@ -20,24 +19,39 @@ def visualize_results(image: np.ndarray, result: dict, name: str, output_dir: st
     defect_type = result["defect_type"]
     location = result["location"]
 
-    title = "File: {}\nStatus: {}".format(name, status)
-    color = 'green' if status == 'Good' else 'red'
+    title_lines = ["File: {}".format(name), "Status: {}".format(status)]
+    color = (0, 255, 0) if status == 'Good' else (0, 0, 255)
 
     if status == "Defective":
-        title += " - Type: {}".format(defect_type)
+        title_lines[1] += " - Type: {}".format(defect_type)
         logging.debug("Drawing defect marker at {}".format(location))
         cv2.circle(image, location, 20, (0, 0, 255), 3)
         cv2.line(image, result["center"], location, (255, 0, 0), 2)
 
+    output_filename = "result_{}".format(name)
+    output_path = os.path.join(output_dir, output_filename)
+
+    if os.environ.get("DEFECT_USE_MPL"):
+        _save_with_matplotlib(image, title_lines, status, output_path)
+    else:
+        # Draw the status banner directly onto the image
+        for i, line in enumerate(title_lines):
+            cv2.putText(image, line, (10, 30 + 30 * i),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
+        cv2.imwrite(output_path, image)
+    logging.info("Saved result image to: {}".format(output_path))
+
+def _save_with_matplotlib(image: np.ndarray, title_lines: list, status: str, output_path: str):
+    """
+    Saves the image as a titled matplotlib figure (set DEFECT_USE_MPL=1).
+    """
+    # Imported lazily: matplotlib is optional and slow to import
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(8, 8))
     plt.imshow(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
-    plt.title(title, color=color, fontsize=14)
+    plt.title("\n".join(title_lines), color='green' if status == 'Good' else 'red', fontsize=14)
     plt.axis('off')
     plt.tight_layout()
-
-    # Save the figure to the specified output directory
-    output_filename = "result_{}".format(name)
-    output_path = os.path.join(output_dir, output_filename)
     plt.savefig(output_path)
-    logging.info("Saved result image to: {}".format(output_path))
-    plt.close() # Close the figure to free up memory
\ No newline at end of file
+    plt.close() # Close the figure to free up memory
@@ -5,12 +5,82 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
+from numba import njit
 from scipy.integrate import solve_ivp
 
 
+@njit(cache=True, fastmath=True)
+def _lorenz(a, b, c, x, y, z):
+    """Lorenz derivatives at (x, y, z)."""
+    return a * (y - x), b * x - y - x * z, x * y - c * z
+
+
+@njit(cache=True, fastmath=True)
+def _rk4_step(a, b, c, x, y, z, h):
+    """Advance (x, y, z) by one classical RK4 step of size h."""
+    k1x, k1y, k1z = _lorenz(a, b, c, x, y, z)
+    k2x, k2y, k2z = _lorenz(a, b, c, x + 0.5 * h * k1x, y + 0.5 * h * k1y, z + 0.5 * h * k1z)
+    k3x, k3y, k3z = _lorenz(a, b, c, x + 0.5 * h * k2x, y + 0.5 * h * k2y, z + 0.5 * h * k2z)
+    k4x, k4y, k4z = _lorenz(a, b, c, x + h * k3x, y + h * k3y, z + h * k3z)
+    return (x + h / 6.0 * (k1x + 2.0 * k2x + 2.0 * k3x + k4x),
+            y + h / 6.0 * (k1y + 2.0 * k2y + 2.0 * k3y + k4y),
+            z + h / 6.0 * (k1z + 2.0 * k2z + 2.0 * k3z + k4z))
+
+
+@njit(cache=True, fastmath=True)
+def _integrate_lorenz(a, b, c, x0, y0, z0, t_start, t_end, n, max_step):
+    """Integrate the Lorenz system with fixed-step RK4 and sample n evenly spaced points.
+
+    The step depends only on the time span and max_step, never on n, so every
+    sampling of the same span sees the same trajectory. Samples between steps
+    are filled in by cubic Hermite interpolation.
+    """
+    times = np.linspace(t_start, t_end, n)
+    traj = np.empty((n, 3))
+    span = t_end - t_start
+    m = max(1, int(np.ceil(abs(span) / max_step)))
+    h = span / m
+
+    # State and derivative at both ends of the current step k
+    k = 0
+    xa, ya, za = x0, y0, z0
+    fxa, fya, fza = _lorenz(a, b, c, xa, ya, za)
+    xb, yb, zb = _rk4_step(a, b, c, xa, ya, za, h)
+    fxb, fyb, fzb = _lorenz(a, b, c, xb, yb, zb)
+
+    for i in range(n):
+        if h == 0.0:
+            traj[i, 0], traj[i, 1], traj[i, 2] = x0, y0, z0
+            continue
+        pos = (times[i] - t_start) / h
+        idx = min(max(int(pos), 0), m - 1)
+        while k < idx:
+            xa, ya, za, fxa, fya, fza = xb, yb, zb, fxb, fyb, fzb
+            xb, yb, zb = _rk4_step(a, b, c, xa, ya, za, h)
+            fxb, fyb, fzb = _lorenz(a, b, c, xb, yb, zb)
+            k += 1
+
+        s = pos - idx
+        h00 = (1.0 + 2.0 * s) * (1.0 - s) * (1.0 - s)
+        h10 = s * (1.0 - s) * (1.0 - s) * h
+        h01 = s * s * (3.0 - 2.0 * s)
+        h11 = s * s * (s - 1.0) * h
+        traj[i, 0] = h00 * xa + h10 * fxa + h01 * xb + h11 * fxb
+        traj[i, 1] = h00 * ya + h10 * fya + h01 * yb + h11 * fyb
+        traj[i, 2] = h00 * za + h10 * fza + h01 * zb + h11 * fzb
+
+    return times, traj
+
+
 class BeeTrajectorySimulator:
     """Simulate and visualize 3D bee movement using Lorenz equations."""
     
+    # Line plots are decimated to about this many points; more is not
+    # visible at screen resolution and only slows down drawing.
+    max_plot_points = 2000
+    # Largest RK4 step of the default integrator, independent of num_points
+    max_step = 0.005
+    
     def __init__(self, a=10, b=28, c=2.667, initial_state=(0, 1, 1.05)):
         self.a = a
         self.b = b
@@ -28,8 +98,21 @@ class BeeTrajectorySimulator:
             x * y - self.c * z
         ]
     
-    def simulate(self, t_span=(0, 30), num_points=10000):
-        """Simulate bee trajectory."""
+    def simulate(self, t_span=(0, 30), num_points=10000, rtol=None):
+        """Simulate bee trajectory.
+
+        Uses a compiled fixed-step RK4 by default, stepping at most max_step
+        whatever num_points is; pass rtol to use the adaptive RK45 solver
+        from scipy with that tolerance instead.
+        """
+        if rtol is None:
+            x0, y0, z0 = (float(v) for v in self.initial_state)
+            self.time_points, self.trajectory = _integrate_lorenz(
+                float(self.a), float(self.b), float(self.c), x0, y0, z0,
+                float(t_span[0]), float(t_span[1]), num_points, float(self.max_step)
+            )
+            return self.trajectory, self.time_points
+
         t_eval = np.linspace(t_span[0], t_span[1], num_points)
         
         solution = solve_ivp(
@@ -38,13 +121,17 @@ class BeeTrajectorySimulator:
             self.initial_state,
             t_eval=t_eval,
             method='RK45',
-            rtol=1e-8
+            rtol=rtol
         )
         
         self.time_points = solution.t
         self.trajectory = solution.y.T
         return self.trajectory, self.time_points
     
+    def _plot_stride(self):
+        """Step between plotted samples so at most ~max_plot_points are drawn."""
+        return max(1, len(self.trajectory) // self.max_plot_points)
+    
     def plot_3d_trajectory(self, figsize=(12, 9)):
         """Create 3D visualization of bee path."""
         if self.trajectory is None:
@@ -54,9 +141,9 @@ class BeeTrajectorySimulator:
         ax = fig.add_subplot(111, projection='3d')
         
 
-        ax.plot(self.trajectory[:, 0], self.trajectory[:, 1], 
-                self.trajectory[:, 2], 'steelblue', linewidth=0.6, 
-                alpha=0.7, label='Bee Flight Path')
+        path = self.trajectory[::self._plot_stride()]
+        ax.plot(path[:, 0], path[:, 1], path[:, 2], 'steelblue',
+                linewidth=0.6, alpha=0.7, label='Bee Flight Path')
         
         # Start position
         ax.scatter(*self.initial_state, color='green', s=100,
@@ -91,13 +178,16 @@ class BeeTrajectorySimulator:
         fig, axes = plt.subplots(2, 2, figsize=figsize)
         components = ['X', 'Y', 'Z']
         colors = ['blue', 'green', 'red']
+        stride = self._plot_stride()
+        times = self.time_points[::stride]
+        path = self.trajectory[::stride]
         
         # Individual component plots
         for i, (comp, color) in enumerate(zip(components, colors)):
             if i < 3:
                 row, col = divmod(i, 2)
                 ax = axes[row, col]
-                ax.plot(self.time_points, self.trajectory[:, i],
+                ax.plot(times, path[:, i],
                        color=color, linewidth=0.8, alpha=0.8)
                 ax.set_xlabel('Time')
                 ax.set_ylabel(f'{comp} Position')
@@ -107,7 +197,7 @@ class BeeTrajectorySimulator:
         # Combined plot
         ax = axes[1, 1]
         for i, (comp, color) in enumerate(zip(components, colors)):
-            ax.plot(self.time_points, self.trajectory[:, i],
+            ax.plot(times, path[:, i],
                    color=color, linewidth=0.8, alpha=0.7, label=f'{comp}(t)')
         ax.set_xlabel('Time')
         ax.set_ylabel('Position')
@@ -129,12 +219,20 @@ class BeeTrajectorySimulator:
         print(f"Time: {self.time_points[0]:.1f} to {self.time_points[-1]:.1f}")
         print(f"Points: {len(self.trajectory)}")
         
+        # Column-wise reductions over the whole trajectory at once
+        stats = np.stack([
+            self.trajectory.mean(axis=0),
+            self.trajectory.std(axis=0),
+            self.trajectory.min(axis=0),
+            self.trajectory.max(axis=0),
+        ])
+        
         components = ['X', 'Y', 'Z']
         for i, comp in enumerate(components):
-            data = self.trajectory[:, i]
-            print(f"{comp}: mean={np.mean(data):6.2f}, "
-                  f"std={np.std(data):5.2f}, "
-                  f"range=[{np.min(data):6.2f}, {np.max(data):6.2f}]")
+            mean, std, low, high = stats[:, i]
+            print(f"{comp}: mean={mean:6.2f}, "
+                  f"std={std:5.2f}, "
+                  f"range=[{low:6.2f}, {high:6.2f}]")
 
 
 def main():
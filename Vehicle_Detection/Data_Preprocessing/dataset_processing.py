@@ -1,27 +1,45 @@
 import os
 import xml.etree.ElementTree as ET
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import List, Tuple, Dict, Set
 
+YOLO_LINE_FORMAT = '%d %.6f %.6f %.6f %.6f'
+
+
+def scan_files(directory: str, extension: str) -> List[os.DirEntry]:
+    """List the regular files in a directory whose names end with extension."""
+    with os.scandir(directory) as entries:
+        return [e for e in entries if e.name.endswith(extension) and e.is_file()]
+
+
+def read_xml_class_names(xml_path: str) -> Set[str]:
+    """Extract the unique class names from one XML annotation file."""
+    classes = set()
+    
+    try:
+        for _, elem in ET.iterparse(xml_path, events=('end',)):
+            if elem.tag != 'object':
+                continue
+            class_name = elem.find('name')
+            if class_name is not None:
+                classes.add(class_name.text.strip())
+            # Free the subtree so memory stays flat regardless of object count
+            elem.clear()
+    except ET.ParseError as e:
+        print(f"Error parsing {os.path.basename(xml_path)}: {e}")
+    
+    return classes
+
 
 def scan_xml_files_for_classes(xml_dir: str) -> Set[str]:
     """Extract all unique class names from XML annotation files."""
     classes = set()
-    xml_files = [f for f in os.listdir(xml_dir) if f.endswith('.xml')]
-    
-    for xml_file in xml_files:
-        xml_path = os.path.join(xml_dir, xml_file)
-        try:
-            tree = ET.parse(xml_path)
-            root = tree.getroot()
-            
-            for obj in root.findall('object'):
-                class_name = obj.find('name')
-                if class_name is not None:
-                    classes.add(class_name.text.strip())
-        except ET.ParseError as e:
-            print(f"Error parsing {xml_file}: {e}")
-            continue
+    
+    for entry in scan_files(xml_dir, '.xml'):
+        classes.update(read_xml_class_names(entry.path))
     
     return classes
 
@@ -42,72 +60,99 @@ def create_classes_file(classes: Set[str], output_dir: str) -> Dict[str, int]:
     return class_to_id
 
 
-def convert_bbox_to_yolo(bbox: Tuple[int, int, int, int], 
-                        img_width: int, img_height: int) -> Tuple[float, float, float, float]:
-    """Convert absolute bbox coordinates to YOLO format (normalized center, width, height)."""
-    xmin, ymin, xmax, ymax = bbox
+def convert_bbox_to_yolo(bboxes: np.ndarray, img_width: int, img_height: int) -> np.ndarray:
+    """Convert absolute (xmin, ymin, xmax, ymax) boxes to YOLO format (normalized center, width, height).
     
-    # Calculate center coordinates and dimensions
-    center_x = (xmin + xmax) / 2.0
-    center_y = (ymin + ymax) / 2.0
-    width = xmax - xmin
-    height = ymax - ymin
+    Accepts a single box or an (N, 4) array and converts all boxes at once.
+    """
+    boxes = np.asarray(bboxes, dtype=np.float64)
+    scale = np.array([img_width, img_height], dtype=np.float64)
     
-    # Normalize to 0-1 range
-    center_x /= img_width
-    center_y /= img_height
-    width /= img_width
-    height /= img_height
+    # Calculate center coordinates and dimensions, normalized to 0-1 range
+    centers = (boxes[..., :2] + boxes[..., 2:]) / 2.0 / scale
+    sizes = (boxes[..., 2:] - boxes[..., :2]) / scale
     
-    return center_x, center_y, width, height
+    return np.concatenate((centers, sizes), axis=-1)
+
+
+def read_xml_annotation(xml_path: str) -> Tuple[int, int, List[Tuple[str, int, int, int, int]]]:
+    """Read image size and (name, xmin, ymin, xmax, ymax) objects from an XML file."""
+    width = height = None
+    objects = []
+
+    for _, elem in ET.iterparse(xml_path, events=('end',)):
+        if elem.tag == 'size':
+            width = int(elem.find('width').text)
+            height = int(elem.find('height').text)
+        elif elem.tag == 'object':
+            bbox = elem.find('bndbox')
+            objects.append((
+                elem.find('name').text.strip(),
+                int(bbox.find('xmin').text),
+                int(bbox.find('ymin').text),
+                int(bbox.find('xmax').text),
+                int(bbox.find('ymax').text),
+            ))
+            elem.clear()
+
+    return width, height, objects
+
+
+def annotation_to_yolo(annotation: Tuple[int, int, List[Tuple[str, int, int, int, int]]],
+                       class_to_id: Dict[str, int], xml_path: str) -> np.ndarray:
+    """Convert an annotation read by read_xml_annotation to an (N, 5) YOLO array."""
+    width, height, objects = annotation
+    if width is None:
+        print(f"No size info in {xml_path}")
+        return np.empty((0, 5))
+
+    cls_list = []
+    bbox_list = []
+
+    for class_name, xmin, ymin, xmax, ymax in objects:
+        if class_name not in class_to_id:
+            print(f"Unknown class '{class_name}' in {xml_path}")
+            continue
+        cls_list.append(class_to_id[class_name])
+        bbox_list.append((xmin, ymin, xmax, ymax))
+
+    if not bbox_list:
+        return np.empty((0, 5))
+
+    return np.column_stack((cls_list, convert_bbox_to_yolo(bbox_list, width, height)))
 
 
-def parse_xml_annotation(xml_path: str, class_to_id: Dict[str, int]) -> List[str]:
-    """Parse XML file and return YOLO format annotation lines."""
+def parse_xml_annotation(xml_path: str, class_to_id: Dict[str, int]) -> np.ndarray:
+    """Parse XML file and return YOLO format annotations as an (N, 5) array."""
     try:
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
-        
-        # Get image dimensions
-        size = root.find('size')
-        if size is None:
-            print(f"No size info in {xml_path}")
-            return []
-        
-        width = int(size.find('width').text)
-        height = int(size.find('height').text)
-        
-        yolo_lines = []
-        
-        # Process each object
-        for obj in root.findall('object'):
-            class_name = obj.find('name').text.strip()
-            
-            if class_name not in class_to_id:
-                print(f"Unknown class '{class_name}' in {xml_path}")
-                continue
-            
-            # Get bounding box coordinates
-            bbox = obj.find('bndbox')
-            xmin = int(bbox.find('xmin').text)
-            ymin = int(bbox.find('ymin').text)
-            xmax = int(bbox.find('xmax').text)
-            ymax = int(bbox.find('ymax').text)
-            
-            # Convert to YOLO format
-            center_x, center_y, w, h = convert_bbox_to_yolo(
-                (xmin, ymin, xmax, ymax), width, height
-            )
-            
-            class_id = class_to_id[class_name]
-            yolo_line = f"{class_id} {center_x:.6f} {center_y:.6f} {w:.6f} {h:.6f}"
-            yolo_lines.append(yolo_line)
-        
-        return yolo_lines
-        
+        return annotation_to_yolo(read_xml_annotation(xml_path), class_to_id, xml_path)
+    except Exception as e:
+        print(f"Error processing {xml_path}: {e}")
+        return np.empty((0, 5))
+
+
+def read_xml_annotation_safe(xml_path: str):
+    """Read an XML annotation and the class names it contains.
+    
+    Returns (annotation, class_names). If the annotation cannot be read (e.g. a
+    non-integer coordinate) it is None, but class names are still collected by
+    a names-only pass so they match scan_xml_files_for_classes.
+    """
+    try:
+        annotation = read_xml_annotation(xml_path)
+        return annotation, {obj[0] for obj in annotation[2]}
     except Exception as e:
         print(f"Error processing {xml_path}: {e}")
-        return []
+        return None, read_xml_class_names(xml_path)
+
+
+def write_yolo_labels(labels_dir: str, xml_file: str, yolo_labels: np.ndarray) -> bool:
+    """Write YOLO labels for an XML file; an empty file is written if there are none."""
+    txt_filename = os.path.splitext(xml_file)[0] + '.txt'
+    txt_path = os.path.join(labels_dir, txt_filename)
+
+    np.savetxt(txt_path, yolo_labels, fmt=YOLO_LINE_FORMAT)
+    return len(yolo_labels) > 0
 
 
 def convert_xml_to_yolo(xml_dir: str, output_dir: str, class_to_id: Dict[str, int]) -> None:
@@ -115,25 +160,18 @@ def convert_xml_to_yolo(xml_dir: str, output_dir: str, class_to_id: Dict[str, in
     labels_dir = os.path.join(output_dir, 'labels')
     os.makedirs(labels_dir, exist_ok=True)
     
-    xml_files = [f for f in os.listdir(xml_dir) if f.endswith('.xml')]
+    xml_entries = scan_files(xml_dir, '.xml')
+    xml_files = [e.name for e in xml_entries]
+    xml_paths = [e.path for e in xml_entries]
     converted_count = 0
     
-    for xml_file in xml_files:
-        xml_path = os.path.join(xml_dir, xml_file)
-        
-
-        txt_filename = os.path.splitext(xml_file)[0] + '.txt'
-        txt_path = os.path.join(labels_dir, txt_filename)
-        
-        yolo_lines = parse_xml_annotation(xml_path, class_to_id)
-        
-        if yolo_lines:
-            with open(txt_path, 'w') as f:
-                f.write('\n'.join(yolo_lines))
-            converted_count += 1
-        else:
-            # Create empty file if no valid annotations
-            open(txt_path, 'w').close()
+    # Parsing is pure Python, so spread it over processes; writes stay here
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(partial(parse_xml_annotation, class_to_id=class_to_id),
+                                xml_paths, chunksize=32)
+        for xml_file, yolo_labels in zip(xml_files, results):
+            if write_yolo_labels(labels_dir, xml_file, yolo_labels):
+                converted_count += 1
     
     print(f"Converted {converted_count}/{len(xml_files)} XML files to YOLO format")
 
@@ -143,9 +181,19 @@ def process_dataset(input_dir: str, output_dir: str) -> None:
     print(f"Processing dataset from: {input_dir}")
     print(f"Output directory: {output_dir}")
     
-    # Step 1: Scan for unique classes
+    # Step 1: Parse every XML file once, collecting classes and objects
     print("Scanning XML files for unique classes...")
-    classes = scan_xml_files_for_classes(input_dir)
+    xml_entries = scan_files(input_dir, '.xml')
+    xml_files = [e.name for e in xml_entries]
+    xml_paths = [e.path for e in xml_entries]
+    annotations = {}
+    classes = set()
+
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(read_xml_annotation_safe, xml_paths, chunksize=32)
+        for xml_file, (annotation, class_names) in zip(xml_files, results):
+            annotations[xml_file] = annotation
+            classes.update(class_names)
     
     if not classes:
         print("No classes found in XML files!")
@@ -156,10 +204,22 @@ def process_dataset(input_dir: str, output_dir: str) -> None:
     # Step 2: Create classes.txt file
     class_to_id = create_classes_file(classes, output_dir)
     
-    # Step 3: Convert XML files to YOLO format
+    # Step 3: Write YOLO labels from the in-memory annotations
     print("Converting XML annotations to YOLO format...")
-    convert_xml_to_yolo(input_dir, output_dir, class_to_id)
-    
+    labels_dir = os.path.join(output_dir, 'labels')
+    os.makedirs(labels_dir, exist_ok=True)
+    converted_count = 0
+
+    for xml_file, annotation in annotations.items():
+        xml_path = os.path.join(input_dir, xml_file)
+        if annotation:
+            yolo_labels = annotation_to_yolo(annotation, class_to_id, xml_path)
+        else:
+            yolo_labels = np.empty((0, 5))
+        if write_yolo_labels(labels_dir, xml_file, yolo_labels):
+            converted_count += 1
+
+    print(f"Converted {converted_count}/{len(xml_files)} XML files to YOLO format")
     print("Dataset processing completed!")
 
 
@@ -172,12 +232,11 @@ def validate_yolo_dataset(labels_dir: str, classes_file: str) -> None:
     with open(classes_file, 'r') as f:
         num_classes = len(f.readlines())
     
-    txt_files = [f for f in os.listdir(labels_dir) if f.endswith('.txt')]
+    txt_files = scan_files(labels_dir, '.txt')
     total_annotations = 0
     
     for txt_file in txt_files:
-        txt_path = os.path.join(labels_dir, txt_file)
-        with open(txt_path, 'r') as f:
+        with open(txt_file.path, 'r') as f:
             lines = [line.strip() for line in f.readlines() if line.strip()]
             total_annotations += len(lines)
     
@@ -7,8 +7,9 @@ updates class indices, and saves the filtered dataset to a new location.
 
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Set, Dict, Tuple
+from typing import Iterable, List, Set, Dict, Tuple
 import logging
 
 
@@ -43,7 +44,7 @@ class YOLODatasetFilter:
             with open(self.classes_file, 'r', encoding='utf-8') as f:
                 self.original_classes = [line.strip() for line in f.readlines()]
             
-            self.logger.info(f"Loaded {len(self.original_classes)} classes from {self.classes_file}")
+            self.logger.info("Loaded %d classes from %s", len(self.original_classes), self.classes_file)
             new_index = 0
             for old_index, class_name in enumerate(self.original_classes):
                 if class_name in self.selected_classes:
@@ -51,19 +52,56 @@ class YOLODatasetFilter:
                     self.class_mapping[old_index] = new_index
                     new_index += 1
             
-            self.logger.info(f"Selected {len(self.selected_class_indices)} classes for filtering")
+            self.logger.info("Selected %d classes for filtering", len(self.selected_class_indices))
             
         except FileNotFoundError:
-            self.logger.error(f"Classes file not found: {self.classes_file}")
+            self.logger.error("Classes file not found: %s", self.classes_file)
             raise
         except Exception as e:
-            self.logger.error(f"Error loading classes: {e}")
+            self.logger.error("Error loading classes: %s", e)
             raise
     
     def create_output_structure(self) -> None:
         """Create output directory structure."""
         self.output_path.mkdir(parents=True, exist_ok=True)
     
+    def filter_annotation_lines(self, label_file: Path, lines: Iterable[str]) -> List[str]:
+        """
+        Filter annotation lines one at a time, warning about malformed lines.
+        
+        Args:
+            label_file: Path to input label file (for log messages)
+            lines: Lines of the label file (e.g. the open file)
+            
+        Returns:
+            List[str]: Kept annotation lines with remapped class ids
+        """
+        filtered_lines = []
+        
+        for line_num, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line:
+                continue
+            
+            try:
+                parts = line.split()
+                if len(parts) < 5:
+                    self.logger.warning("Invalid annotation format in %s:%d", label_file, line_num)
+                    continue
+                
+                old_class_id = int(parts[0])
+    
+                if old_class_id in self.selected_class_indices:
+                    new_class_id = self.class_mapping[old_class_id]
+                    parts[0] = str(new_class_id)
+                    filtered_lines.append(' '.join(parts))
+            
+            except (ValueError, IndexError) as e:
+                self.logger.warning("Error parsing line %d in %s: %s", line_num, label_file, e)
+                continue
+        
+        return filtered_lines
+    
     def filter_annotation_file(self, label_file: Path, output_file: Path) -> bool:
         """
         Filter a single annotation file to keep only selected classes.
@@ -76,31 +114,8 @@ class YOLODatasetFilter:
             bool: True if file has any valid annotations, False otherwise
         """
         try:
-            filtered_lines = []
-            
             with open(label_file, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    try:
-                        parts = line.split()
-                        if len(parts) < 5:
-                            self.logger.warning(f"Invalid annotation format in {label_file}:{line_num}")
-                            continue
-                        
-                        old_class_id = int(parts[0])
-            
-                        if old_class_id in self.selected_class_indices:
-                            new_class_id = self.class_mapping[old_class_id]
-                            parts[0] = str(new_class_id)
-                            filtered_lines.append(' '.join(parts))
-                    
-                    except (ValueError, IndexError) as e:
-                        self.logger.warning(f"Error parsing line {line_num} in {label_file}: {e}")
-                        continue
-   
+                filtered_lines = self.filter_annotation_lines(label_file, f)
             if filtered_lines:
                 output_file.parent.mkdir(parents=True, exist_ok=True)
                 with open(output_file, 'w', encoding='utf-8') as f:
@@ -110,16 +125,34 @@ class YOLODatasetFilter:
             return False
             
         except Exception as e:
-            self.logger.error(f"Error processing {label_file}: {e}")
+            self.logger.error("Error processing %s: %s", label_file, e)
             return False
     
     def copy_image_file(self, image_file: Path, output_file: Path) -> None:
         """Copy image file to output location."""
         try:
             output_file.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(image_file, output_file)
+            if hasattr(os, 'copy_file_range'):
+                try:
+                    self._copy_in_kernel(image_file, output_file)
+                except OSError:
+                    shutil.copyfile(image_file, output_file)
+            else:
+                shutil.copyfile(image_file, output_file)
+            shutil.copystat(image_file, output_file)
         except Exception as e:
-            self.logger.error(f"Error copying image {image_file}: {e}")
+            self.logger.error("Error copying image %s: %s", image_file, e)
+    
+    @staticmethod
+    def _copy_in_kernel(src: Path, dst: Path) -> None:
+        """Copy file contents with copy_file_range (no userspace buffers, reflinks on CoW filesystems)."""
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
     
     def get_image_extensions(self) -> Tuple[str, ...]:
         """Get common image file extensions."""
@@ -136,6 +169,25 @@ class YOLODatasetFilter:
         
         return None
     
+    def process_label_file(self, label_file: Path) -> bool:
+        """
+        Filter one label file and copy its image if any annotations remain.
+        
+        Returns:
+            bool: True if the label file was kept, False otherwise
+        """
+        output_label_file = self.output_path / label_file.name
+        if not self.filter_annotation_file(label_file, output_label_file):
+            return False
+        
+        corresponding_image = self.find_corresponding_image(label_file)
+        if corresponding_image:
+            output_image_file = self.output_path / corresponding_image.name
+            self.copy_image_file(corresponding_image, output_image_file)
+        else:
+            self.logger.warning("No corresponding image found for %s", label_file)
+        return True
+    
     def process_dataset(self) -> None:
         """Process the entire dataset."""
         self.logger.info("Starting dataset filtering process...")
@@ -144,29 +196,22 @@ class YOLODatasetFilter:
         kept_files = 0
         
 
-        for label_file in self.dataset_path.glob('*.txt'):
-            if label_file.name == 'classes.txt':
-                continue
-            
-            output_label_file = self.output_path / label_file.name
-            has_valid_annotations = self.filter_annotation_file(label_file, output_label_file)
-            processed_files += 1
-            
-            if has_valid_annotations:
-                kept_files += 1
-                corresponding_image = self.find_corresponding_image(label_file)
-                
-                if corresponding_image:
-                    output_image_file = self.output_path / corresponding_image.name
-                    self.copy_image_file(corresponding_image, output_image_file)
-                else:
-                    self.logger.warning(f"No corresponding image found for {label_file}")
+        with os.scandir(self.dataset_path) as entries:
+            label_files = [Path(e.path) for e in entries
+                           if e.name.endswith('.txt') and e.name != 'classes.txt' and e.is_file()]
+        
+        # Overlap label filtering with image copies, which are I/O bound
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for kept in executor.map(self.process_label_file, label_files):
+                processed_files += 1
+                if kept:
+                    kept_files += 1
 
-            if processed_files % 100 == 0:
-                self.logger.info(f"Processed {processed_files} files, kept {kept_files}")
+                if processed_files % 100 == 0:
+                    self.logger.info("Processed %d files, kept %d", processed_files, kept_files)
         
-        self.logger.info(f"Dataset filtering complete. Processed {processed_files} files, "
-                        f"kept {kept_files} files with valid annotations.")
+        self.logger.info("Dataset filtering complete. Processed %d files, "
+                         "kept %d files with valid annotations.", processed_files, kept_files)
     
     def create_filtered_classes_file(self) -> None:
         """Create new classes.txt file with only selected classes."""
@@ -177,8 +222,8 @@ class YOLODatasetFilter:
             for class_name in filtered_classes:
                 f.write(f"{class_name}\n")
         
-        self.logger.info(f"Created filtered classes file: {output_classes_file}")
-        self.logger.info(f"New class mapping: {dict(zip(filtered_classes, range(len(filtered_classes))))}")
+        self.logger.info("Created filtered classes file: %s", output_classes_file)
+        self.logger.info("New class mapping: %s", dict(zip(filtered_classes, range(len(filtered_classes)))))
     
     def run(self) -> None:
         """Run the complete filtering process."""
@@ -188,7 +233,7 @@ class YOLODatasetFilter:
             
             invalid_classes = set(self.selected_classes) - set(self.original_classes)
             if invalid_classes:
-                self.logger.error(f"Invalid class names: {invalid_classes}")
+                self.logger.error("Invalid class names: %s", invalid_classes)
                 return
 
             self.create_output_structure()
@@ -198,7 +243,7 @@ class YOLODatasetFilter:
             self.logger.info("Dataset filtering completed successfully!")
             
         except Exception as e:
-            self.logger.error(f"Error during dataset filtering: {e}")
+            self.logger.error("Error during dataset filtering: %s", e)
             raise
 
 
@@ -1,9 +1,14 @@
+import argparse
 import os
-from typing import List, Set
+from typing import Optional, Set
 
-def validate_image_labels(folder_path: str):
+def validate_image_labels(folder_path: str, verbose: bool = False,
+                          details_file: Optional[str] = None):
     """
     Checks if all image files (.jpg) in a folder have a matching YOLO label file (.txt).
+
+    Only counts are printed by default; pass verbose=True to list every
+    mismatched file, or details_file to write the list to disk instead.
     """
     print(f"--- Checking Label Correspondence in: {folder_path} ---")
 
@@ -12,17 +17,18 @@ def validate_image_labels(folder_path: str):
         return
 
 
-    all_files: List[str] = os.listdir(folder_path)
     image_names: Set[str] = set()
     label_names: Set[str] = set()
 
-    for file_name in all_files:
-        base_name, ext = os.path.splitext(file_name)
-        
-        if ext.lower() in ('.jpg', '.jpeg', '.png'):
-            image_names.add(base_name)
-        elif ext.lower() == '.txt':
-            label_names.add(base_name)
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            base_name, ext = os.path.splitext(entry.name)
+            ext = ext.lower()
+            
+            if ext in ('.jpg', '.jpeg', '.png'):
+                image_names.add(base_name)
+            elif ext == '.txt':
+                label_names.add(base_name)
     
     # Missing labels: Image exists, but no corresponding .txt file
     missing_labels: Set[str] = image_names.difference(label_names)
@@ -39,14 +45,33 @@ def validate_image_labels(folder_path: str):
         
         if missing_labels:
             print(f"\n- MISSING LABEL FILES ({len(missing_labels)}):")
-            for name in sorted(list(missing_labels)):
-                print(f"  > {name}.jpg is missing a {name}.txt file.")
+            if verbose:
+                for name in sorted(missing_labels):
+                    print(f"  > {name}.jpg is missing a {name}.txt file.")
                 
         if orphan_labels:
             print(f"\n- ORPHAN LABEL FILES ({len(orphan_labels)}):")
-            for name in sorted(list(orphan_labels)):
-                print(f"  > {name}.txt is missing a corresponding image file.")
+            if verbose:
+                for name in sorted(orphan_labels):
+                    print(f"  > {name}.txt is missing a corresponding image file.")
+
+        if details_file:
+            with open(details_file, 'w') as f:
+                f.write(f"MISSING LABEL FILES ({len(missing_labels)}):\n")
+                f.writelines(f"{name}\n" for name in missing_labels)
+                f.write(f"ORPHAN LABEL FILES ({len(orphan_labels)}):\n")
+                f.writelines(f"{name}\n" for name in orphan_labels)
+            print(f"\nDetails written to: {details_file}")
+
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Check image/label correspondence')
+    parser.add_argument('folder', nargs='?', default="/home/katomaran/Downloads/vishal/archive/FINAL",
+                        help='Folder containing images and YOLO label files')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Print every missing/orphan file name')
+    parser.add_argument('--details_file', type=str, default=None,
+                        help='Write the missing/orphan file names to this file')
+    args = parser.parse_args()
 
-folder_to_check = "/home/katomaran/Downloads/vishal/archive/FINAL"
-validate_image_labels(folder_to_check)
\ No newline at end of file
+    validate_image_labels(args.folder, args.verbose, args.details_file)
@@ -1,24 +1,81 @@
 """
 Concise YOLO Dataset EDA - Object Count, Distribution & Heatmap
 """
+import io
 import os
+import re
+import json
 import argparse
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
 from collections import defaultdict
-from typing import List, Dict
+from multiprocessing import Pool
+from typing import List, Dict, Optional, Tuple
+
+
+# A line whose first token is not an integer literal (e.g. "2.0" or "1e0")
+_NON_INT_CLASS = re.compile(r'^[ \t]*(?![-+]?\d+(?:[ \t]|$))\S', re.MULTILINE)
+
+
+def _parse_yolo_lines(lines: List[str]) -> np.ndarray:
+    """Line-by-line parser for label files np.loadtxt cannot read, skipping bad lines."""
+    rows = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        
+        try:
+            parts = line.split()
+            if len(parts) != 5:
+                continue
+            
+            class_id = int(parts[0])
+            center_x, center_y = float(parts[1]), float(parts[2])
+            float(parts[3]), float(parts[4])
+            rows.append((class_id, center_x, center_y))
+        except ValueError:
+            continue
+    
+    return np.array(rows, dtype=np.float32).reshape(-1, 3)
+
+
+def parse_yolo_annotation(txt_file: str) -> Optional[np.ndarray]:
+    """Parse a label file into a (k, 3) array of class id, center x and center y."""
+    with open(txt_file, 'r') as f:
+        text = f.read()
+    if not text.strip():
+        return None
+    
+    # np.loadtxt would accept float class ids, which int() in the line parser rejects
+    data = None
+    if not _NON_INT_CLASS.search(text):
+        try:
+            # comments=None: a '#' makes the line malformed, as in the line parser
+            data = np.loadtxt(io.StringIO(text), dtype=np.float32, ndmin=2, comments=None)
+        except ValueError:
+            pass
+    
+    if data is None or data.shape[1] != 5:
+        data = _parse_yolo_lines(text.splitlines())
+    
+    return data[:, :3]
 
 
 class YOLODatasetAnalyzer:
-    def __init__(self, dataset_path: str, output_dir: str = "eda_output"):
+    def __init__(self, dataset_path: str, output_dir: str = "eda_output",
+                 show_plots: bool = False):
         self.dataset_path = Path(dataset_path)
         self.output_dir = Path(output_dir)
+        self.show_plots = show_plots
         self.output_dir.mkdir(exist_ok=True)
         self.classes = self._load_classes()
-        self.annotations_data = []
+        # Annotations are stored column-wise (structure of arrays)
+        self.class_ids = np.empty(0, dtype=np.int32)
+        self.centers_x = np.empty(0, dtype=np.float32)
+        self.centers_y = np.empty(0, dtype=np.float32)
         
     def _load_classes(self) -> List[str]:
         classes_file = self.dataset_path / "classes.txt"
@@ -28,108 +85,171 @@ class YOLODatasetAnalyzer:
         with open(classes_file, 'r') as f:
             return [line.strip() for line in f.readlines()]
     
-    def _parse_yolo_annotation(self, txt_file: Path) -> List[Dict]:
-        annotations = []
-        if not txt_file.exists() or txt_file.stat().st_size == 0:
-            return annotations
-        
-        with open(txt_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                try:
-                    parts = line.split()
-                    if len(parts) != 5:
-                        continue
-                    
-                    class_id = int(parts[0])
-                    center_x, center_y, width, height = map(float, parts[1:])
-                    
-                    annotations.append({
-                        'class_name': self.classes[class_id] if class_id < len(self.classes) else f'unknown_{class_id}',
-                        'center_x': center_x,
-                        'center_y': center_y
-                    })
-                except (ValueError, IndexError):
-                    continue
-        
-        return annotations
-    
-    def load_dataset(self) -> None:
-        txt_files = [f for f in self.dataset_path.glob("*.txt") if f.name != "classes.txt"]
+    def _label_files(self) -> List[os.DirEntry]:
+        with os.scandir(self.dataset_path) as entries:
+            return [e for e in entries if e.name.endswith('.txt') and e.name != 'classes.txt']
+    
+    def _fingerprint(self, label_files: List[os.DirEntry]) -> str:
+        """Identify the dataset state a cache was built from."""
+        # Adding or removing files changes the directory mtime; editing one changes its own
+        return json.dumps({
+            'dataset': str(self.dataset_path.resolve()),
+            'files': len(label_files),
+            'dir_mtime_ns': self.dataset_path.stat().st_mtime_ns,
+            'newest_mtime_ns': max((e.stat().st_mtime_ns for e in label_files), default=0),
+        })
+    
+    def load_dataset(self, label_files: Optional[List[os.DirEntry]] = None) -> None:
+        if label_files is None:
+            label_files = self._label_files()
+        txt_files = [e.path for e in label_files]
         print(f"Found {len(txt_files)} annotation files")
         
-        for txt_file in txt_files:
-            annotations = self._parse_yolo_annotation(txt_file)
-            self.annotations_data.extend(annotations)
+        # Files are independent, so parse them across all cores
+        chunks = []
+        with Pool(os.cpu_count()) as pool:
+            for annotations in pool.imap_unordered(parse_yolo_annotation, txt_files, chunksize=256):
+                if annotations is not None:
+                    chunks.append(annotations)
+        
+        # Concatenate once instead of growing per-annotation containers
+        data = np.concatenate(chunks) if chunks else np.empty((0, 3), dtype=np.float32)
+        self._set_annotations(data)
+        
+        print(f"Loaded {len(self.class_ids)} annotations")
+    
+    def _set_annotations(self, data: np.ndarray) -> None:
+        """Store an (N, 3) class id / center x / center y array as separate columns."""
+        # Split into contiguous int32/float32 columns rather than strided views
+        self.class_ids = data[:, 0].astype(np.int32)
+        self.centers_x = np.ascontiguousarray(data[:, 1], dtype=np.float32)
+        self.centers_y = np.ascontiguousarray(data[:, 2], dtype=np.float32)
+    
+    def save_cache(self, cache_path: Path, fingerprint: str) -> None:
+        """Save the dataset fingerprint followed by the (N, 3) float32 annotations."""
+        data = np.column_stack((self.class_ids, self.centers_x, self.centers_y)).astype(np.float32)
+        # Write through a handle so np.save stores at exactly cache_path
+        with open(cache_path, 'wb') as f:
+            np.save(f, np.array(fingerprint))
+            np.save(f, data)
+        print(f"Saved annotation cache: {cache_path}")
+    
+    def load_cache(self, cache_path: Path, fingerprint: str) -> bool:
+        """Load annotations saved by save_cache if it matches the current dataset."""
+        try:
+            with open(cache_path, 'rb') as f:
+                if str(np.load(f)) != fingerprint:
+                    print(f"Annotation cache is out of date, rebuilding: {cache_path}")
+                    return False
+                data = np.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Cannot read annotation cache {cache_path}, rebuilding: {e}")
+            return False
         
-        print(f"Loaded {len(self.annotations_data)} annotations")
+        self._set_annotations(data)
+        print(f"Loaded {len(self.class_ids)} annotations from cache: {cache_path}")
+        return True
     
-    def plot_visualizations(self, df: pd.DataFrame) -> None:
+    def _finish_figure(self) -> None:
+        """Show the current figure if requested, otherwise close it without blocking."""
+        if self.show_plots:
+            plt.show()
+        else:
+            plt.close()
+    
+    def count_classes(self) -> Tuple[List[str], np.ndarray]:
+        """Return class labels and their object counts, most frequent first."""
+        # Count the integer ids; names are only looked up for the unique ones
+        ids, counts = np.unique(self.class_ids, return_counts=True)
+        order = np.argsort(-counts, kind='stable')
+        ids, counts = ids[order], counts[order]
+        labels = [self.classes[i] if 0 <= i < len(self.classes) else f'unknown_{i}'
+                  for i in ids]
+        return labels, counts
+    
+    def plot_visualizations(self) -> None:
         """Generate three separate visualization files."""
-        class_counts = df['class_name'].value_counts()
+        labels, class_counts = self.count_classes()
         
         # 1. Object Count by Class
         plt.figure(figsize=(14, 8))
-        sns.barplot(data=pd.DataFrame({'class': class_counts.index, 'count': class_counts.values}),
-                x='class', y='count')
+        sns.barplot(x=labels, y=class_counts)
         plt.title('Object Count by Class', fontsize=16)
         plt.xticks(rotation=45, ha='right')
+        plt.xlabel('class')
         plt.ylabel('Number of Objects')
         plt.tight_layout()
         plt.savefig(self.output_dir / 'object_count.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        self._finish_figure()
         
         # 2. Class Distribution Pie Chart
         plt.figure(figsize=(10, 10))
-        threshold = len(df) * 0.02
-        major_classes = class_counts[class_counts >= threshold]
-        minor_classes_sum = class_counts[class_counts < threshold].sum()
+        threshold = len(self.class_ids) * 0.02
+        major = class_counts >= threshold
+        pie_labels = [label for label, keep in zip(labels, major) if keep]
+        pie_values = class_counts[major].tolist()
+        minor_classes_sum = class_counts[~major].sum()
         
         if minor_classes_sum > 0:
-            plot_data = major_classes.copy()
-            plot_data['Others'] = minor_classes_sum
-        else:
-            plot_data = major_classes
+            pie_labels.append('Others')
+            pie_values.append(minor_classes_sum)
         
-        colors = plt.cm.Set3(np.linspace(0, 1, len(plot_data)))
-        plt.pie(plot_data.values, labels=plot_data.index, autopct='%1.1f%%',
+        colors = plt.cm.Set3(np.linspace(0, 1, len(pie_values)))
+        plt.pie(pie_values, labels=pie_labels, autopct='%1.1f%%',
             colors=colors, startangle=90, labeldistance=1.1)
         plt.title('Class Distribution (Percentage)', fontsize=16)
         plt.tight_layout()
         plt.savefig(self.output_dir / 'class_distribution.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        self._finish_figure()
         
         # 3. Object Density Heatmap
+        # Bin once in NumPy and draw the counts as an image
+        counts, _, _ = np.histogram2d(self.centers_x, self.centers_y,
+                                      bins=25, range=[[0, 1], [0, 1]])
         plt.figure(figsize=(10, 8))
-        plt.hist2d(df['center_x'], df['center_y'], bins=25, cmap='Blues')
+        im = plt.imshow(counts.T, origin='lower', extent=[0, 1, 0, 1], cmap='Blues',
+                        aspect='auto', interpolation='nearest')
+        # Keep the count grid a bitmap even in vector formats; axes stay vector
+        im.set_rasterized(True)
         plt.title('Object Density Heatmap', fontsize=16)
         plt.xlabel('Center X (Normalized)')
         plt.ylabel('Center Y (Normalized)')
-        plt.colorbar()
+        plt.colorbar(im)
         plt.tight_layout()
-        plt.savefig(self.output_dir / 'density_heatmap.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        # A 25x25 grid has no detail that 300 dpi would add
+        plt.savefig(self.output_dir / 'density_heatmap.png', dpi=150, bbox_inches='tight')
+        self._finish_figure()
     
-    def run_analysis(self) -> None:
+    def run_analysis(self, cache_path: Optional[str] = None) -> None:
+        """Load the annotations, plot them and print a summary.
+        
+        If cache_path is given, annotations are read from it when it was built
+        from the current label files; otherwise they are parsed and the cache
+        is (re)written.
+        """
         print("Starting YOLO Dataset Analysis...")
-        self.load_dataset()
+        if cache_path:
+            cache_path = Path(cache_path)
+            label_files = self._label_files()
+            fingerprint = self._fingerprint(label_files)
+            if not (cache_path.exists() and self.load_cache(cache_path, fingerprint)):
+                self.load_dataset(label_files)
+                self.save_cache(cache_path, fingerprint)
+        else:
+            self.load_dataset()
         
-        if not self.annotations_data:
+        if len(self.class_ids) == 0:
             print("No annotations found!")
             return
         
-        df = pd.DataFrame(self.annotations_data)
-        self.plot_visualizations(df)
+        self.plot_visualizations()
         
         # Summary stats
-        class_counts = df['class_name'].value_counts()
+        labels, _ = self.count_classes()
         print(f"\nSummary:")
-        print(f"Total Objects: {len(df)}")
+        print(f"Total Objects: {len(self.class_ids)}")
         print(f"Classes: {len(self.classes)}")
-        print(f"Top 3 classes: {', '.join(class_counts.head(3).index.tolist())}")
+        print(f"Top 3 classes: {', '.join(labels[:3])}")
         print(f"Results saved in: {self.output_dir}")
 
 
@@ -139,6 +259,10 @@ def main():
                        help='Path to YOLO dataset folder')
     parser.add_argument('--output_dir', type=str, default='eda_output',
                        help='Output directory for results')
+    parser.add_argument('--show', action='store_true',
+                       help='Display each plot after saving it')
+    parser.add_argument('--cache', type=str, default=None,
+                       help='Annotation cache file; written on the first run, reused while the labels are unchanged')
     
     args = parser.parse_args()
     
@@ -146,15 +270,15 @@ def main():
         print(f"Dataset path does not exist: {args.dataset_path}")
         return
     
-    analyzer = YOLODatasetAnalyzer(args.dataset_path, args.output_dir)
-    analyzer.run_analysis()
+    analyzer = YOLODatasetAnalyzer(args.dataset_path, args.output_dir, show_plots=args.show)
+    analyzer.run_analysis(args.cache)
 
 
 if __name__ == "__main__":
     if len(os.sys.argv) == 1:
         dataset_path = input("Enter dataset folder path: ").strip()
         if os.path.exists(dataset_path):
-            analyzer = YOLODatasetAnalyzer(dataset_path)
+            analyzer = YOLODatasetAnalyzer(dataset_path, show_plots=True)
             analyzer.run_analysis()
         else:
             print("Invalid path!")
@@ -5,25 +5,112 @@ This script runs a YOLO model on a directory of images, saves the annotated
 results, and calculates the inference speed in Frames Per Second (FPS).
 """
 
+import os
+import queue
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Callable, Iterator, List, Optional, Tuple
 
 import cv2
+import numpy as np
+from tqdm import tqdm
 from ultralytics import YOLO
 
+BATCH_SIZE = 16
+IMAGE_SIZE = 640
+WRITER_THREADS = 4
+PREFETCH_SIZE = BATCH_SIZE * 2
+# Each queued write holds a full-size image; allow one batch plus a little slack
+MAX_PENDING_WRITES = BATCH_SIZE + 2 * WRITER_THREADS
+ENCODE_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 90]
+
 
 def get_image_paths(input_path: Path) -> List[Path]:
     """Finds all image files in a given directory."""
-    extensions = ("*.jpg", "*.jpeg", "*.png", "*.JPG", "*.PNG")
-    image_paths = []
-    for ext in extensions:
-        image_paths.extend(input_path.glob(ext))
-    return image_paths
+    extensions = (".jpg", ".jpeg", ".png")
+    with os.scandir(input_path) as entries:
+        return [Path(entry.path) for entry in entries
+                if os.path.splitext(entry.name)[1].lower() in extensions]
+
+
+def prefetch_images(image_paths: List[Path], out_queue: queue.Queue) -> None:
+    """Decodes images in order onto out_queue, followed by a None sentinel."""
+    for img_path in image_paths:
+        out_queue.put((img_path, cv2.imread(str(img_path))))
+    out_queue.put(None)
 
 
-def measure_performance(model_path: str, input_path: str, output_dir: str = None):
+def iter_batches(image_paths: List[Path], batch_size: int,
+                 on_skip: Optional[Callable[[Path], None]] = None) -> Iterator[Tuple[List[Path], list]]:
+    """Yields (paths, images) batches decoded ahead of time on a background thread.
+
+    Images that fail to decode are left out; on_skip is called for each of them.
+    """
+    # The bounded queue lets JPEG decoding run ahead of the GPU by a couple
+    # of batches without holding the whole dataset in memory.
+    decoded = queue.Queue(maxsize=PREFETCH_SIZE)
+    threading.Thread(target=prefetch_images, args=(image_paths, decoded), daemon=True).start()
+
+    paths, imgs = [], []
+    while (item := decoded.get()) is not None:
+        img_path, img = item
+        if img is None:
+            tqdm.write(f"Warning: could not read {img_path.name}, skipping.")
+            if on_skip:
+                on_skip(img_path)
+            continue
+        paths.append(img_path)
+        imgs.append(img)
+        if len(imgs) == batch_size:
+            yield paths, imgs
+            paths, imgs = [], []
+    if imgs:
+        yield paths, imgs
+
+
+def output_name(img_path: Path) -> str:
+    """Returns a JPEG file name for a result that is unique per input file name."""
+    # Keep the source extension for other formats so a.png and a.jpg don't collide
+    if img_path.suffix.lower() in ('.jpg', '.jpeg'):
+        return img_path.name
+    return f"{img_path.name}.jpg"
+
+
+def save_annotated(results, output_file: Path) -> bool:
+    """Draws the detections for one result and writes it to disk as a JPEG."""
+    # Encoding releases the GIL, so several writer threads encode in parallel;
+    # the file is then written with a single call.
+    ok, buf = cv2.imencode('.jpg', results.plot(), ENCODE_PARAMS)
+    if ok:
+        output_file.write_bytes(buf)
+    return ok
+
+
+def load_model(model_path: str, use_engine: bool = False) -> YOLO:
+    """Loads the model, optionally from a TensorRT FP16 engine built next to it."""
+    if not use_engine:
+        return YOLO(model_path)
+
+    engine_path = Path(model_path).with_suffix('.engine')
+    if not engine_path.exists():
+        print(f"Exporting TensorRT engine to {engine_path} (one-time)...")
+        # Dynamic batch so the engine accepts both the warmup image and full batches
+        YOLO(model_path).export(format='engine', half=True, imgsz=IMAGE_SIZE,
+                                batch=BATCH_SIZE, dynamic=True)
+    return YOLO(str(engine_path), task='detect')
+
+
+def write_succeeded(future: Future) -> bool:
+    """Waits for a save_annotated task and reports whether it wrote its file."""
+    return future.exception() is None and future.result()
+
+
+def measure_performance(model_path: str, input_path: str, output_dir: str = None,
+                        use_engine: bool = False):
     """
     Run YOLO inference on image(s) and calculate performance.
 
@@ -32,6 +119,8 @@ def measure_performance(model_path: str, input_path: str, output_dir: str = None
         input_path (str): Path to a single image or a folder of images.
         output_dir (str, optional): Directory to save results.
                                     Defaults to "output".
+        use_engine (bool, optional): Run a TensorRT engine exported from
+                                     model_path instead of the .pt weights.
     """
     # --- 1. Setup Paths ---
     source_path = Path(input_path)
@@ -43,7 +132,7 @@ def measure_performance(model_path: str, input_path: str, output_dir: str = None
 
     # --- 2. Load Model and Images ---
     try:
-        model = YOLO(model_path)
+        model = load_model(model_path, use_engine)
         images = [source_path] if source_path.is_file() else get_image_paths(source_path)
 
         if not images:
@@ -58,26 +147,54 @@ def measure_performance(model_path: str, input_path: str, output_dir: str = None
     print("-" * 30)
 
     # --- 3. Run Inference and Time It ---
+    # Warm up once so CUDA context creation, cuDNN autotuning and model
+    # fusing are not counted against the FPS figure.
+    model.predict(np.zeros((IMAGE_SIZE, IMAGE_SIZE, 3), dtype=np.uint8),
+                  imgsz=IMAGE_SIZE, half=True, verbose=False)
+
     processed_count = 0
     start_time = time.monotonic()
 
+    # Drawing, encoding and writing results happens on worker threads so it
+    # overlaps with the next forward pass. The timer stops only after all
+    # writes finish, so the FPS figure stays end-to-end.
+    executor = ThreadPoolExecutor(max_workers=WRITER_THREADS)
+    pending_writes = deque()
+    failed_writes = 0
+    progress = tqdm(total=len(images), desc="Processing", unit="img")
+
     try:
-        for i, img_path in enumerate(images, 1):
-            results = model(str(img_path), verbose=False)[0]
-            annotated_img = results.plot()
-            output_file = output_path / img_path.name
-            cv2.imwrite(str(output_file), annotated_img)
-            processed_count = i
-            print(f"\rProcessing: [{i}/{len(images)}] {img_path.name}", end="")
+        # Images are decoded on a background thread and fed to the model in
+        # batches, so decoding overlaps with the forward pass. FP16 is only
+        # used on GPU; Ultralytics ignores half=True on CPU.
+        # Skipped images still count towards the bar so it ends at the total
+        batches = iter_batches(images, BATCH_SIZE, on_skip=lambda _: progress.update(1))
+        for batch_paths, batch_imgs in batches:
+            batch_results = model.predict(batch_imgs, imgsz=IMAGE_SIZE, half=True, verbose=False)
+            for img_path, results in zip(batch_paths, batch_results):
+                output_file = output_path / output_name(img_path)
+                pending_writes.append(executor.submit(save_annotated, results, output_file))
+                processed_count += 1
+                # If the writers fall behind, wait on the oldest write so
+                # memory stays bounded instead of growing with the folder
+                while len(pending_writes) > MAX_PENDING_WRITES:
+                    failed_writes += not write_succeeded(pending_writes.popleft())
+            progress.update(len(batch_paths))
 
     except KeyboardInterrupt:
-        print("\n\nInterrupted by user.")
+        print("\nInterrupted by user.")
     finally:
+        executor.shutdown(wait=True)
         end_time = time.monotonic()
+        progress.close()
+
+    failed_writes += sum(not write_succeeded(f) for f in pending_writes)
+    if failed_writes:
+        print(f"Warning: failed to save {failed_writes} result image(s).")
 
     # --- 4. Calculate and Display Performance ---
     total_time = end_time - start_time
-    print(f"\n" + "-" * 30)
+    print("-" * 30)
     print("Inference Complete.")
 
     if processed_count > 0 and total_time > 0:
@@ -94,15 +211,20 @@ def measure_performance(model_path: str, input_path: str, output_dir: str = None
 
 
 def main():
-    if len(sys.argv) < 3:
-        print("Usage: python your_script_name.py <path_to_model.pt> <path_to_image_or_folder> [output_directory]")
+    args = sys.argv[1:]
+    use_engine = '--engine' in args
+    if use_engine:
+        args.remove('--engine')
+
+    if len(args) < 2:
+        print("Usage: python your_script_name.py <path_to_model.pt> <path_to_image_or_folder> [output_directory] [--engine]")
         sys.exit(1)
 
-    model_path = sys.argv[1]
-    input_path = sys.argv[2]
-    output_dir = sys.argv[3] if len(sys.argv) > 3 else None
+    model_path = args[0]
+    input_path = args[1]
+    output_dir = args[2] if len(args) > 2 else None
 
-    measure_performance(model_path, input_path, output_dir)
+    measure_performance(model_path, input_path, output_dir, use_engine)
 
 
 if __name__ == "__main__":
@@ -2,28 +2,45 @@
 YOLO Dataset Splitter - Train/Val/Test split with image-label correspondence
 """
 import os
+import errno
 import shutil
 import argparse
 import random
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Tuple, Dict
 
+import yaml
+
+
+# How split files are materialized: hard links and symlinks avoid copying
+# any image data; 'hardlink' falls back to a copy across filesystems.
+LINK_MODES = ('hardlink', 'symlink', 'copy')
+COPY_WORKERS = 16
+# Link errors that mean "links are not possible here" rather than a real failure
+LINK_FALLBACK_ERRNOS = {errno.EXDEV, errno.EPERM, errno.ENOTSUP}
+
 
 class YOLODatasetSplitter:
     def __init__(self, dataset_path: str, output_path: str, 
                  train_ratio: float = 0.7, val_ratio: float = 0.2, 
-                 test_ratio: float = 0.1, random_state: int = 42):
+                 test_ratio: float = 0.1, random_state: int = 42,
+                 link_mode: str = 'hardlink'):
         self.dataset_path = Path(dataset_path)
         self.output_path = Path(output_path)
         self.train_ratio = train_ratio
         self.val_ratio = val_ratio
         self.test_ratio = test_ratio
         
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"link_mode must be one of {LINK_MODES}")
+        self.link_mode = link_mode
+        
         # Validate ratios
         if abs(train_ratio + val_ratio + test_ratio - 1.0) > 1e-6:
             raise ValueError("Split ratios must sum to 1.0")
         
-        random.seed(random_state)
+        self.random_state = random_state
         
         # Supported image formats
         self.image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif'}
@@ -31,15 +48,21 @@ class YOLODatasetSplitter:
     def find_image_label_pairs(self) -> List[Tuple[Path, Path]]:
         """Find matching image-label pairs."""
         image_files = []
-        for ext in self.image_extensions:
-            image_files.extend(self.dataset_path.glob(f"*{ext}"))
-            image_files.extend(self.dataset_path.glob(f"*{ext.upper()}"))
+        label_stems = set()
+        
+        # Classify every entry in a single directory pass
+        with os.scandir(self.dataset_path) as entries:
+            for entry in entries:
+                stem, ext = os.path.splitext(entry.name)
+                if ext.lower() in self.image_extensions:
+                    image_files.append(Path(entry.path))
+                elif ext == '.txt':
+                    label_stems.add(stem)
         
         pairs = []
         for img_path in image_files:
-            label_path = img_path.with_suffix('.txt')
-            if label_path.exists():
-                pairs.append((img_path, label_path))
+            if img_path.stem in label_stems:
+                pairs.append((img_path, img_path.with_suffix('.txt')))
             else:
                 print(f"Warning: No label file for {img_path.name}")
         
@@ -53,7 +76,10 @@ class YOLODatasetSplitter:
     
     def split_dataset(self, pairs: List[Tuple[Path, Path]]) -> Dict[str, List[Tuple[Path, Path]]]:
         """Split pairs into train/val/test sets."""
-        random.shuffle(pairs)
+        # Seed per call so repeated splits don't depend on global RNG state;
+        # shuffle a copy in place, which is cheaper than sample()
+        pairs = list(pairs)
+        random.Random(self.random_state).shuffle(pairs)
         
         total = len(pairs)
         train_count = int(total * self.train_ratio)
@@ -67,19 +93,47 @@ class YOLODatasetSplitter:
         
         return splits
     
+    def _link_or_copy(self, src: Path, dst: Path) -> None:
+        """Place src at dst according to link_mode."""
+        # Replace output from a previous run; copying onto an existing hard
+        # link would otherwise write into the source file itself.
+        dst.unlink(missing_ok=True)
+        
+        try:
+            if self.link_mode == 'symlink':
+                os.symlink(src.resolve(), dst)
+                return
+            if self.link_mode == 'hardlink':
+                try:
+                    os.link(src, dst)
+                    return
+                except OSError as e:
+                    # Copy only when linking is unsupported here, e.g. the
+                    # output is on another filesystem
+                    if e.errno not in LINK_FALLBACK_ERRNOS:
+                        raise
+            shutil.copy2(src, dst)
+        except FileExistsError:
+            # Another worker placed the same source here first (a.jpg and
+            # a.png share labels/a.txt); that result is already correct.
+            if not os.path.samefile(src, dst):
+                raise
+    
     def copy_files(self, splits: Dict[str, List[Tuple[Path, Path]]]) -> None:
-        """Copy files to respective directories."""
+        """Copy (or link) files to respective directories."""
+        tasks = []
         for split_name, pairs in splits.items():
             print(f"Copying {len(pairs)} pairs to {split_name}...")
             
             for img_path, label_path in pairs:
-                # Copy image
                 dst_img = self.output_path / split_name / 'images' / img_path.name
-                shutil.copy2(img_path, dst_img)
-                
-                # Copy label
                 dst_label = self.output_path / split_name / 'labels' / label_path.name
-                shutil.copy2(label_path, dst_label)
+                tasks.append((img_path, dst_img))
+                tasks.append((label_path, dst_label))
+        
+        # Copies are I/O bound; run several at once to keep the disk queue full
+        with ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+            list(executor.map(lambda task: self._link_or_copy(*task), tasks))
     
     def copy_classes_file(self) -> None:
         """Copy classes.txt to output directory if exists."""
@@ -107,31 +161,23 @@ class YOLODatasetSplitter:
         if not class_names:
             return
 
-        nc = len(class_names)
+        # Using the base path is critical for relative dataset paths to work;
+        # train/val/test are relative to it
+        data = {
+            'path': str(self.output_path.resolve()),
+            'train': 'train/images',
+            'val': 'val/images',
+            'test': 'test/images',
+            'nc': len(class_names),
+            'names': class_names,
+        }
         
-        # Format the class names into a YAML list string (e.g., 'class1', 'class2')
-        names_yaml_list = ', '.join(f"'{name}'" for name in class_names)
-
-        # Construct the YAML content
-        # Using the base path is critical for relative dataset paths to work
-        yaml_content = f"""# YOLOv8 dataset configuration
-# The 'path' should point to the directory containing 'train', 'val', 'test' folders.
-path: {self.output_path.resolve()} 
-
-# Training/Validation/Test sets relative to 'path'
-train: train/images
-val: val/images
-test: test/images
-
-# Number of classes
-nc: {nc}
-
-# Class names
-names: [{names_yaml_list}]"""
+        # safe_dump quotes class names that need it; flow style keeps names on one line
+        yaml_content = "# YOLOv8 dataset configuration\n" + yaml.safe_dump(
+            data, sort_keys=False, default_flow_style=None, allow_unicode=True)
         
         yaml_path = self.output_path / 'data.yaml'
-        with open(yaml_path, 'w') as f:
-            f.write(yaml_content)
+        yaml_path.write_text(yaml_content)
         
         print(f"Generated data.yaml file: {yaml_path}")
     
@@ -188,6 +234,8 @@ def main():
                         help='Test set ratio (default: 0.1)')
     parser.add_argument('--random_state', type=int, default=42,
                         help='Random seed for reproducibility (default: 42)')
+    parser.add_argument('--link_mode', choices=LINK_MODES, default='hardlink',
+                        help='How to place files in the splits (default: hardlink)')
     
     args = parser.parse_args()
     
@@ -201,7 +249,8 @@ def main():
         train_ratio=args.train_ratio,
         val_ratio=args.val_ratio,
         test_ratio=args.test_ratio,
-        random_state=args.random_state
+        random_state=args.random_state,
+        link_mode=args.link_mode
     )
     
     try: